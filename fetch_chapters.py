@@ -2,6 +2,7 @@ import asyncio
 import re
 import subprocess
 import time
+from collections import deque
 from typing import List, Tuple, Optional
 from pathlib import Path
 
@@ -12,10 +13,15 @@ from mcp.client.stdio import stdio_client
 
 from loguru import logger
 
+_TITLE_SUFFIX_RE = re.compile(r'\s*–\s*Băng Phách$')
+
 class MCPClient:
-    def __init__(self):
+    def __init__(self, max_concurrent_calls: int = 16):
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
+        # Bound in-flight tool calls so long URL lists don't storm the server
+        self.max_concurrent_calls = max_concurrent_calls
+        self.semaphore = asyncio.Semaphore(max_concurrent_calls)
 
     def get_tools_information(self, tools:List[Tool]):
         tools_information = []
@@ -47,6 +53,11 @@ class MCPClient:
             logger.error(f"Error during setup MCP: {e}")
             raise e
 
+    async def call_tool(self, name: str, arguments: dict):
+        """Call an MCP tool, waiting for a free slot if too many calls are in flight"""
+        async with self.semaphore:
+            return await self.session.call_tool(name, arguments)
+
     async def disconnect(self):
         """Properly cleanup all async contexts"""
         try:
@@ -65,29 +76,30 @@ class MCPClient:
 def parse_chapter_text(raw_text: str):
     # Split into lines for easier processing
     lines = raw_text.split('\n')
-    title = None
-    content_lines = []
-    in_content = False
 
+    # Locate the first 'Content:' line; everything after it is chapter content
+    content_start = next(
+        (i for i, line in enumerate(lines) if line.startswith('Content:')), len(lines)
+    )
+
+    title = None
     for line in lines:
         if line.startswith('Title:'):
             # Remove 'Title:' and strip whitespace
             title_line = line[len('Title:'):].strip()
             # Remove trailing '– Băng Phách' or similar
-            title = re.sub(r'\s*–\s*Băng Phách$', '', title_line)
-        elif line.startswith('Content:'):
-            in_content = True
-            continue  # Skip the 'Content:' line itself
-        elif in_content:
-            # Skip unwanted headers or repeated titles
-            if line.startswith('###') or 'Vương Tử Ngược Bắc Em Xuôi Nam' in line:
-                continue
-            if line.strip() == '':
-                continue  # Skip empty lines
-            content_lines.append(line.strip())
-
-    content = '\n'.join(content_lines).strip()
-    return {'title': title, 'content': content}
+            title = _TITLE_SUFFIX_RE.sub('', title_line)
+
+    # Skip field lines, unwanted headers, repeated titles and empty lines
+    content_lines = [
+        stripped
+        for line in lines[content_start + 1:]
+        if not line.startswith(('Title:', 'Content:', '###'))
+        and 'Vương Tử Ngược Bắc Em Xuôi Nam' not in line
+        and (stripped := line.strip())
+    ]
+
+    return {'title': title, 'content': '\n'.join(content_lines)}
 
 async def main():
     """Main entry point."""
@@ -101,36 +113,48 @@ async def main():
       "args": ["-y", "fetcher-mcp"]
     })
 
+    # Read URLs to fetch
     urls = []
-
-    # Read URLs and create concurrent fetch tasks
-    fetch_tasks = []
     with open("/Users/nguyenh/workspace/trans/agent_mesh/chunking/vuong_tu_nguoc_bac_em_xuoi_nam.txt", "r") as f:
         for line in f:
             url = line.strip()
             if url:  # Skip empty lines
-                task = mcp_client.session.call_tool(
-                    "fetch_url",
-                    {
-                        "url": url,
-                        "extractContent": True
-                    }
-                )
-                fetch_tasks.append(task)
-    
-    # Wait for all futures and collect responses in order
-    responses = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-    
-    with open("/Users/nguyenh/workspace/trans/agent_mesh/chunking/vuong_tu_nguoc_bac_em_xuoi_nam_raw.txt", "w") as f:
-        for i, response in enumerate(responses):
-            if isinstance(response, Exception):
-                logger.error(f"Failed to fetch URL {i}: {response}")
-            else:
-                try:
-                    parsed_chapter = parse_chapter_text(response.content[0].text)
-                    f.write(f"Title: {parsed_chapter['title']}\nContent: {parsed_chapter['content']}\n\n-----\n")
-                except Exception as e:
-                    logger.error(f"Failed to parse chapter {i+1}: {e}")
+                urls.append(url)
+
+    async def fetch(url: str):
+        # Return failures instead of raising so one bad URL doesn't cancel the whole group
+        try:
+            return await mcp_client.call_tool(
+                "fetch_url",
+                {
+                    "url": url,
+                    "extractContent": True
+                }
+            )
+        except Exception as e:
+            return e
+
+    # Fetch concurrently and write chapters in order. Fetches are only started up to
+    # max_concurrent_calls chapters ahead of the one being written, so a slow early chapter
+    # can hold back at most that many finished responses in memory
+    window = mcp_client.max_concurrent_calls
+    with open("/Users/nguyenh/workspace/trans/agent_mesh/chunking/vuong_tu_nguoc_bac_em_xuoi_nam_raw.txt", "w", buffering=1 << 16) as f:
+        async with asyncio.TaskGroup() as tg:
+            pending = deque()
+            next_url = 0
+            for i in range(len(urls)):
+                while next_url < len(urls) and next_url < i + window:
+                    pending.append(tg.create_task(fetch(urls[next_url])))
+                    next_url += 1
+                response = await pending.popleft()
+                if isinstance(response, Exception):
+                    logger.error(f"Failed to fetch URL {i}: {response}")
+                else:
+                    try:
+                        parsed_chapter = parse_chapter_text(response.content[0].text)
+                        f.write(f"Title: {parsed_chapter['title']}\nContent: {parsed_chapter['content']}\n\n-----\n")
+                    except Exception as e:
+                        logger.error(f"Failed to parse chapter {i+1}: {e}")
 
     await mcp_client.disconnect()
 
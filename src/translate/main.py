@@ -1,5 +1,7 @@
-from dspy import Module, LM, ChainOfThought
+from dspy import Module, LM, ChainOfThought, Prediction, streamify
+from dspy.streaming import StreamListener, StreamResponse
 from translate_signature import TranslateSignature
+from translate_batcher import TranslateBatcher
 import os
 
 from collections.abc import AsyncGenerator
@@ -14,13 +16,35 @@ class TranslateModule(Module):
         llm = LM(
             model="openrouter/deepseek/deepseek-chat-v3-0324:free",
             api_key=os.getenv("KEY"),
+            # The system message carries the static TranslateSignature instructions; mark it
+            # cacheable so providers with prompt caching can skip prefilling it on every call
+            cache_control_injection_points=[{"location": "message", "role": "system"}],
         )
         self.cot = ChainOfThought(TranslateSignature)
         self.cot.set_lm(llm)
 
     def forward(self, input: str, translate_goal: str) -> str:
         return self.cot(input=input, translate_goal=translate_goal)
-    
+
+    async def stream(self, input: str, translate_goal: str) -> AsyncGenerator[str, None]:
+        # StreamListener keeps per-stream state, so each call gets its own listener and wrapper
+        stream_cot = streamify(
+            self.cot,
+            stream_listeners=[StreamListener(signature_field_name="output")],
+        )
+        streamed = False
+        async for value in stream_cot(input=input, translate_goal=translate_goal):
+            if isinstance(value, StreamResponse):
+                streamed = True
+                yield value.chunk
+            elif isinstance(value, Prediction) and not streamed:
+                # Nothing was streamed (e.g. a cached response), so send the whole output
+                yield value.output
+
+# Built once so requests don't pay for LM and ChainOfThought setup every time
+_TRANSLATOR = TranslateModule()
+_BATCHER = TranslateBatcher(_TRANSLATOR)
+
 server = Server()
 
 @server.agent(
@@ -63,17 +87,13 @@ async def translate_agent(input: list[Message], context: Context) -> AsyncGenera
         )
 
     try:
-        translated_text = TranslateModule().forward(input=raw_input, translate_goal=translate_target)
-        yield Message(
-            role="agent/translation",
-            parts=[
-                MessagePart(
-                    role="agent/translation",
-                    content=translated_text.output,
-                    content_type="text/plain",
-                )
-            ],
-        )
+        # Forward the translation as it is decoded instead of waiting for the full completion
+        async for chunk in _TRANSLATOR.stream(input=raw_input, translate_goal=translate_target):
+            yield MessagePart(
+                role="agent/translation",
+                content=chunk,
+                content_type="text/plain",
+            )
     except Exception as e:
         yield Message(
             role="agent/translation",
@@ -87,4 +107,33 @@ async def translate_agent(input: list[Message], context: Context) -> AsyncGenera
         )
 
 
+@server.agent(
+    name="translate_batch_agent",
+    description=(
+        "Translate input text like translate_agent, batching concurrent requests together for throughput"
+    ),
+    input_content_types=["text/plain", "text/plain"],
+    output_content_types=["text/plain"],
+)
+async def translate_batch_agent(input: list[Message], context: Context) -> AsyncGenerator[RunYield, RunYieldResume]:
+    try:
+        raw_input = input[0].parts[0].content
+        translate_target = input[0].parts[1].content
+        translated_text = await _BATCHER.submit(input=raw_input, translate_goal=translate_target)
+        content = translated_text.output
+    except Exception as e:
+        content = f"Error: {e}"
+
+    yield Message(
+        role="agent/translation",
+        parts=[
+            MessagePart(
+                role="agent/translation",
+                content=content,
+                content_type="text/plain",
+            )
+        ],
+    )
+
+
 server.run()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import asyncio
+
+from dspy import Example, Module, Prediction
+
+MAX_BATCH = 8
+MAX_WAIT_MS = 10
+
+
+class TranslateBatcher:
+    """Collects concurrent translate requests and runs them through the module as one batch"""
+
+    def __init__(self, module: Module, max_batch: int = MAX_BATCH, max_wait_ms: int = MAX_WAIT_MS):
+        self.module = module
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.queue: asyncio.Queue | None = None
+        self.flush_task: asyncio.Task | None = None
+        self.pending_batches: set[asyncio.Task] = set()
+
+    async def submit(self, input: str, translate_goal: str) -> Prediction:
+        # The queue and flush loop are created lazily so they bind to the server's running loop
+        if self.flush_task is None:
+            self.queue = asyncio.Queue()
+            self.flush_task = asyncio.create_task(self.flush_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((input, translate_goal, future))
+        return await future
+
+    async def flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Run the batch in the background so the next one can start filling up
+            task = asyncio.create_task(self.run_batch(batch))
+            self.pending_batches.add(task)
+            task.add_done_callback(self.pending_batches.discard)
+
+    async def run_batch(self, batch: list[tuple[str, str, asyncio.Future]]):
+        examples = [
+            Example(input=input, translate_goal=translate_goal).with_inputs("input", "translate_goal")
+            for input, translate_goal, _ in batch
+        ]
+        try:
+            results = await asyncio.to_thread(
+                self.module.batch,
+                examples,
+                num_threads=len(examples),
+                disable_progress_bar=True,
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is None:
+                future.set_exception(RuntimeError("Translation failed"))
+            else:
+                future.set_result(result)
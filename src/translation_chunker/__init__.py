@@ -1,7 +1,7 @@
 """Text Chunker - A simple system for chunking text for LLM preprocessing."""
 
 from .models import ChunkType, TextChunk, ChunkingConfig
-from .text_chunker import TextChunker
+from .text_chunker import TextChunker, chunk_many, chunk_many_async
 from .simple_token_manager import TokenManager
 from .simple_boundary_optimizer import BoundaryOptimizer
 
@@ -10,6 +10,8 @@ __all__ = [
     "TextChunk", 
     "ChunkingConfig",
     "TextChunker",
+    "chunk_many",
+    "chunk_many_async",
     "TokenManager",
     "BoundaryOptimizer",
 ]
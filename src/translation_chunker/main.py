@@ -12,32 +12,31 @@ from acp_sdk.server import Context, RunYield, RunYieldResume, Server
 
 server = Server()
 
+# Configure for chunking with token limits
+config = ChunkingConfig(
+    max_chunk_tokens=10000,      # Max tokens per chunk
+    overlap_tokens=200,         # Overlap between chunks
+    tokenizer_name="cl100k_base"  # OpenAI tokenizer
+)
+
+# Built once and shared by every request
+_CHUNKER = TextChunker(config)
+
 @server.agent(
     name="chunk_text",
     description="Chunk text into smaller chunks",
 )
 async def chunk_text(input: list[Message], context: Context) -> AsyncGenerator[RunYield, RunYieldResume]:
-    # Configure for chunking with token limits
-    config = ChunkingConfig(
-        max_chunk_tokens=10000,      # Max tokens per chunk
-        overlap_tokens=200,         # Overlap between chunks
-        tokenizer_name="cl100k_base"  # OpenAI tokenizer
-    )
-    
-    # Initialize chunker
-    chunker = TextChunker(config)
-    
     # Example long text (replace with actual long text)
     sample_text = ""
     with open("/Users/nguyenh/workspace/trans/agent_mesh/chunking/story.txt", "r") as f:
         sample_text = f.read()
     
     try:
-        # Chunk the text
-        chunks = chunker.chunk_text(sample_text)
-        
-        # Prepare all chunk parts for a single message
-        for chunk in chunks:
+        # Stream each chunk to the client as soon as it is produced
+        chunks = []
+        for chunk in _CHUNKER.chunk_text_iterator(sample_text):
+            chunks.append(chunk)
             yield MessagePart(
                 content_type="text/plain",
                 content=chunk.text
@@ -45,13 +44,13 @@ async def chunk_text(input: list[Message], context: Context) -> AsyncGenerator[R
         
 
         # Get statistics
-        stats = chunker.get_chunking_stats(chunks)
+        stats = _CHUNKER.get_chunking_stats(chunks)
         print("Chunking Statistics:")
         for key, value in stats.items():
             print(f"  {key}: {value}")
         
         # Validate chunks
-        issues = chunker.validate_chunks(chunks)
+        issues = _CHUNKER.validate_chunks(chunks)
         if issues:
             print("\nValidation Issues:")
             for issue in issues:
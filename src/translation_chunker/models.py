@@ -12,7 +12,7 @@ class ChunkType(Enum):
     FINAL = "final"  # Last chunk in document
 
 
-@dataclass
+@dataclass(slots=True)
 class TextChunk:
     """A chunk of text ready for LLM processing."""
     
@@ -22,7 +22,7 @@ class TextChunk:
     
     # Core Content
     text: str  # The chunk text
-    token_count: int  # Number of tokens in this chunk
+    token_count: int  # Tokens in this chunk, read from the document's tokenization (may differ by a token or two from encoding the chunk alone)
     
     # Metadata
     start_position: int  # Character position in original text
@@ -33,19 +33,22 @@ class TextChunk:
     # Quality Metrics
     boundary_score: float  # How good the boundary is (0-1)
     
-    def __post_init__(self):
-        """Validate chunk data after initialization."""
-        if self.chunk_id < 0:
+    @classmethod
+    def checked(cls, **fields: Any) -> "TextChunk":
+        """Create a chunk and validate its data."""
+        chunk = cls(**fields)
+        if chunk.chunk_id < 0:
             raise ValueError("chunk_id must be non-negative")
-        if not self.text.strip():
+        if not chunk.text.strip():
             raise ValueError("text cannot be empty")
-        if self.token_count <= 0:
+        if chunk.token_count <= 0:
             raise ValueError("token_count must be positive")
-        if self.boundary_score < 0 or self.boundary_score > 1:
+        if chunk.boundary_score < 0 or chunk.boundary_score > 1:
             raise ValueError("boundary_score must be between 0 and 1")
+        return chunk
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkingConfig:
     """Configuration for text chunking process."""
     
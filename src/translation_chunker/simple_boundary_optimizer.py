@@ -1,10 +1,29 @@
 """Simple boundary optimization for text chunking."""
 
+import functools
 import re
-from typing import Tuple, Dict, Any
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from typing import TYPE_CHECKING, Tuple, Dict, Any, Optional
 from .simple_token_manager import TokenManager
 
+if TYPE_CHECKING:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+_PARA_RE = re.compile(r'\n\n+')
+_SENT_RE = re.compile(r'[.!?]\s+')
+_LINE_RE = re.compile(r'\n')
+
+# Separators for the LangChain splitter, from strongest to weakest boundary
+_LANGCHAIN_SEPARATORS = [
+    "\n\n",  # Paragraph breaks
+    "\n",    # Line breaks
+    ". ",    # Sentence endings
+    "! ",    # Exclamation endings
+    "? ",    # Question endings
+    "; ",    # Semicolon breaks
+    ", ",    # Comma breaks
+    " ",     # Word breaks
+]
+
 
 class BoundaryOptimizer:
     """Simple boundary optimization for clean text chunks."""
@@ -12,102 +31,87 @@ class BoundaryOptimizer:
     def __init__(self, token_manager: TokenManager):
         """Initialize boundary optimizer."""
         self.token_manager = token_manager
-        
-        # Configure LangChain splitter for semantic boundaries
-        self.langchain_splitter = RecursiveCharacterTextSplitter(
-            separators=[
-                "\n\n",  # Paragraph breaks
-                "\n",    # Line breaks
-                ". ",    # Sentence endings
-                "! ",    # Exclamation endings
-                "? ",    # Question endings
-                "; ",    # Semicolon breaks
-                ", ",    # Comma breaks
-                " ",     # Word breaks
-            ],
-            chunk_size=1000,  # Will be updated dynamically
-            chunk_overlap=100,
-            length_function=self.token_manager.count_tokens,
-            is_separator_regex=False,
-        )
+        # One LangChain splitter per target size, built on first use and never mutated
+        self._splitter_for = functools.lru_cache(maxsize=16)(self._build_splitter)
     
-    def find_optimal_boundary(self, text: str, target_tokens: int) -> Tuple[int, float]:
-        """Find the best boundary position for target token count."""
-        if not text:
-            return 0, 0.0
-        
-        total_tokens = self.token_manager.count_tokens(text)
+    def find_optimal_boundary(self, text: str, cursor: int, target_tokens: int) -> Tuple[int, float, int]:
+        """Find the best boundary position after cursor for target token count.
+        
+        Positions are absolute offsets into text, so the text is never re-sliced per chunk.
+        Returns the position, its boundary score and the token count of text[cursor:position].
+        """
+        if cursor >= len(text):
+            return cursor, 0.0, 0
+        
+        # Every count below reads the same tokenization of text
+        with self.token_manager.token_table(text):
+            return self._find_optimal_boundary(text, cursor, target_tokens)
+    
+    def _find_optimal_boundary(self, text: str, cursor: int, target_tokens: int) -> Tuple[int, float, int]:
+        """Search for the boundary; see find_optimal_boundary."""
+        total_tokens = self.token_manager.count_prefix_tokens(text, len(text), start=cursor)
         if total_tokens <= target_tokens:
-            return len(text), 1.0
+            return len(text), 1.0, total_tokens
         
         # Get approximate position based on tokens
-        approx_pos = self.token_manager.find_token_boundary(text, target_tokens)
-        
-        # Look for better semantic boundaries nearby
-        search_window = min(500, len(text) // 10)  # Search within 500 chars or 10% of text
-        start_pos = max(0, approx_pos - search_window)
-        end_pos = min(len(text), approx_pos + search_window)
-        
-        best_pos = approx_pos
-        best_score = 0.5  # Base score
-        
-        # Check for paragraph breaks
-        for match in re.finditer(r'\n\n+', text[start_pos:end_pos]):
-            pos = start_pos + match.end()
-            if self._is_within_token_limit(text[:pos], target_tokens):
-                score = 1.0  # Paragraph breaks are best
-                if score > best_score:
-                    best_pos = pos
-                    best_score = score
-        
-        # Check for sentence endings if no good paragraph breaks
-        if best_score < 0.9:
-            for match in re.finditer(r'[.!?]\s+', text[start_pos:end_pos]):
-                pos = start_pos + match.end()
-                if self._is_within_token_limit(text[:pos], target_tokens):
-                    score = 0.8  # Sentence breaks are good
-                    if score > best_score:
-                        best_pos = pos
-                        best_score = score
-        
-        # Check for line breaks if no good sentence breaks
-        if best_score < 0.7:
-            for match in re.finditer(r'\n', text[start_pos:end_pos]):
-                pos = start_pos + match.end()
-                if self._is_within_token_limit(text[:pos], target_tokens):
-                    score = 0.6  # Line breaks are okay
-                    if score > best_score:
-                        best_pos = pos
-                        best_score = score
-        
-        return best_pos, best_score
-    
-    def _is_within_token_limit(self, text: str, target_tokens: int, tolerance: int = 50) -> bool:
-        """Check if text is within token limit with tolerance."""
-        tokens = self.token_manager.count_tokens(text)
-        return tokens <= target_tokens + tolerance
+        approx_pos = self.token_manager.find_token_boundary(text, target_tokens, start=cursor)
+        
+        # Look for better semantic boundaries just before it; nothing past approx_pos can fit
+        search_window = min(500, (len(text) - cursor) // 10)  # Look back 500 chars or 10% of the rest
+        start_pos = max(cursor, approx_pos - search_window)
+        end_pos = approx_pos
+        
+        # Try boundary types from strongest to weakest and stop at the first type that fits
+        for pattern, score in (
+            (_PARA_RE, 1.0),  # Paragraph breaks are best
+            (_SENT_RE, 0.8),  # Sentence breaks are good
+            (_LINE_RE, 0.6),  # Line breaks are okay
+        ):
+            positions = [match.end() for match in pattern.finditer(text, start_pos, end_pos)]
+            token_counts = self.token_manager.count_prefix_tokens_batch(text, positions, start=cursor)
+            
+            # Walk back from the end of the window: the first boundary that fits the target
+            # is the one nearest to it
+            for pos, tokens in zip(reversed(positions), reversed(token_counts)):
+                if tokens <= target_tokens:
+                    return pos, score, tokens
+        
+        approx_tokens = self.token_manager.count_prefix_tokens(text, approx_pos, start=cursor)
+        return approx_pos, 0.5, approx_tokens  # Base score
     
     def create_overlap(self, text: str, overlap_tokens: int) -> str:
         """Create overlap text from the end of previous chunk."""
-        if not text or overlap_tokens <= 0:
-            return ""
+        start, end = self.create_overlap_span(text, overlap_tokens)
+        return text[start:end]
+    
+    def create_overlap_span(
+        self, text: str, overlap_tokens: int, start: int = 0, end: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Find the (start, end) span of overlap at the end of the chunk text[start:end].
+        
+        Positions are absolute offsets into text; callers slice only if they need the text.
+        """
+        if end is None:
+            end = len(text)
+        if start >= end or overlap_tokens <= 0:
+            return end, end
         
         # Find approximate character position for overlap
-        overlap_pos = self.token_manager.find_token_boundary(text, overlap_tokens)
+        overlap_pos = self.token_manager.find_token_boundary(text, overlap_tokens, start=start)
         
-        if overlap_pos >= len(text):
-            return text
+        if overlap_pos >= end:
+            return start, end
         
-        # Try to break at sentence boundary within overlap region
-        overlap_text = text[-overlap_pos:] if overlap_pos > 0 else ""
+        overlap_start = end - (overlap_pos - start)
         
-        # Look for sentence start in overlap
-        sentences = re.split(r'[.!?]\s+', overlap_text)
-        if len(sentences) > 1:
-            # Start from complete sentence
-            return sentences[-1] if sentences[-1] else overlap_text
+        # Try to start from a complete sentence within the overlap region
+        last_break = None
+        for last_break in _SENT_RE.finditer(text, overlap_start, end):
+            pass
+        if last_break is not None and last_break.end() < end:
+            overlap_start = last_break.end()
         
-        return overlap_text
+        return overlap_start, end
     
     def get_boundary_info(self, text: str, position: int) -> Dict[str, Any]:
         """Get information about boundary quality."""
@@ -125,7 +129,10 @@ class BoundaryOptimizer:
         if '\n\n' in context:
             boundary_type = "paragraph"
             score = 1.0
-        elif re.search(r'[.!?]\s', context):
+        elif any(
+            context[i] in '.!?' and context[i + 1].isspace()
+            for i in range(len(context) - 1)
+        ):
             boundary_type = "sentence"
             score = 0.8
         elif '\n' in context:
@@ -148,8 +155,17 @@ class BoundaryOptimizer:
     
     def split_with_langchain(self, text: str, target_tokens: int) -> list[str]:
         """Use LangChain for splitting when needed."""
-        # Update chunk size
-        self.langchain_splitter._chunk_size = target_tokens
-        self.langchain_splitter._chunk_overlap = min(100, target_tokens // 10)
-        
-        return self.langchain_splitter.split_text(text)
\ No newline at end of file
+        return self._splitter_for(target_tokens).split_text(text)
+    
+    def _build_splitter(self, target_tokens: int) -> "RecursiveCharacterTextSplitter":
+        """Build a LangChain splitter sized for target_tokens."""
+        # Imported here so the common chunking path never pays for LangChain
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        
+        return RecursiveCharacterTextSplitter(
+            separators=_LANGCHAIN_SEPARATORS,
+            chunk_size=target_tokens,
+            chunk_overlap=min(100, target_tokens // 10),
+            length_function=self.token_manager.count_tokens,
+            is_separator_regex=False,
+        )
\ No newline at end of file
@@ -1,8 +1,47 @@
 """Simple token management for text chunking."""
 
+import functools
 import tiktoken
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
 from .models import ChunkingConfig
 
+# UTF-8 continuation bytes; every other byte starts a new character
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+@functools.lru_cache(maxsize=4)
+def _get_encoding(name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process and share it across token managers."""
+    return tiktoken.get_encoding(name)
+
+
+def _token_index_at(offsets: List[int], total: int, position: int) -> int:
+    """Index of the token that contains the character at position.
+    
+    A span starting at position still pays for this token even if it began earlier,
+    e.g. the leading-space word token right after a whitespace skip.
+    """
+    if position <= 0:
+        return 0
+    if position >= offsets[total]:
+        return total
+    index = bisect_right(offsets, position, 0, total) - 1
+    # Tokens sharing an offset all start inside the same character; take the first of them
+    return bisect_left(offsets, offsets[index], 0, index)
+
+
+@dataclass(slots=True)
+class _TokenTable:
+    """Tokenization of one text held for the duration of token_table() blocks on it."""
+    
+    text: str  # Held so id(text) can't be reused while the table is live
+    tokens: List[int]
+    offsets: List[int]  # Character offset each token starts at, plus len(text)
+    holders: int = 0  # Open token_table() blocks for text
+
 
 class TokenManager:
     """Simple token counting and management for text chunks."""
@@ -10,38 +49,93 @@ class TokenManager:
     def __init__(self, config: ChunkingConfig):
         """Initialize token manager with configuration."""
         self.config = config
-        self.tokenizer = tiktoken.get_encoding(config.tokenizer_name)
+        self.tokenizer = _get_encoding(config.tokenizer_name)
+        # id(text) -> table for texts inside a token_table() block
+        self._tables: Dict[int, _TokenTable] = {}
         
     def count_tokens(self, text: str) -> int:
         """Count tokens in text using the configured tokenizer."""
         if not text:
             return 0
-        return len(self.tokenizer.encode(text))
+        table = self._tables.get(id(text))
+        if table is not None:
+            return len(table.tokens)
+        return len(self.tokenizer.encode_ordinary(text))
     
-    def find_token_boundary(self, text: str, target_tokens: int) -> int:
-        """Find character position that gives approximately target_tokens."""
-        if not text:
-            return 0
+    @contextmanager
+    def token_table(self, text: str) -> Iterator[None]:
+        """Tokenize text once and reuse the result for every call on it inside the block.
+        
+        The table is dropped when the outermost block for text exits, so nothing outlives
+        the work on that text.
+        """
+        key = id(text)
+        table = self._tables.get(key)
+        if table is None:
+            table = _TokenTable(text, *self._build_token_table(text))
+            self._tables[key] = table
+        table.holders += 1
+        try:
+            yield
+        finally:
+            table.holders -= 1
+            if table.holders == 0:
+                del self._tables[key]
+    
+    def encode_once(self, text: str) -> List[int]:
+        """Encode text, reusing the token list inside a token_table() block for it."""
+        table = self._tables.get(id(text))
+        if table is not None:
+            return table.tokens
+        return self.tokenizer.encode_ordinary(text)
+    
+    def count_prefix_tokens(self, text: str, position: int, start: int = 0) -> int:
+        """Count tokens in text[start:position] using the token table of text."""
+        tokens, offsets = self._token_char_offsets(text)
+        total = len(tokens)
+        first = _token_index_at(offsets, total, start)
+        return max(0, bisect_left(offsets, position, 0, total) - first)
+    
+    def count_prefix_tokens_batch(self, text: str, positions: List[int], start: int = 0) -> List[int]:
+        """Count tokens in text[start:position] for every position with a single tokenization of text."""
+        tokens, offsets = self._token_char_offsets(text)
+        total = len(tokens)
+        first = _token_index_at(offsets, total, start)
+        return [max(0, bisect_left(offsets, position, 0, total) - first) for position in positions]
+    
+    def find_token_boundary(self, text: str, target_tokens: int, start: int = 0) -> int:
+        """Find character position that gives approximately target_tokens after start."""
+        if start >= len(text) or target_tokens <= 0:
+            return start
             
-        total_tokens = self.count_tokens(text)
-        if total_tokens <= target_tokens:
+        tokens, offsets = self._token_char_offsets(text)
+        first = _token_index_at(offsets, len(tokens), start)
+        if len(tokens) - first <= target_tokens:
             return len(text)
         
-        # Binary search for the right character position
-        left, right = 0, len(text)
-        best_pos = 0
-        
-        while left <= right:
-            mid = (left + right) // 2
-            chunk_tokens = self.count_tokens(text[:mid])
-            
-            if chunk_tokens <= target_tokens:
-                best_pos = mid
-                left = mid + 1
-            else:
-                right = mid - 1
+        return offsets[first + target_tokens]
+    
+    def _token_char_offsets(self, text: str) -> Tuple[List[int], List[int]]:
+        """Return the tokens of text with the character offset each starts at."""
+        table = self._tables.get(id(text))
+        if table is not None:
+            return table.tokens, table.offsets
+        return self._build_token_table(text)
+    
+    def _build_token_table(self, text: str) -> Tuple[List[int], List[int]]:
+        """Tokenize text and record the character offset each token starts at.
         
-        return best_pos
+        The offsets list has one extra trailing entry equal to len(text).
+        """
+        tokens = self.tokenizer.encode_ordinary(text)
+        offsets = []
+        offset = 0
+        for token_bytes in self.tokenizer.decode_tokens_bytes(tokens):
+            # A token opening with a continuation byte starts inside the previous character
+            offsets.append(offset - (0x80 <= token_bytes[0] < 0xC0))
+            offset += len(token_bytes.translate(None, _CONTINUATION_BYTES))
+        offsets.append(offset)
+        return tokens, offsets
     
     def calculate_overlap_tokens(self, text: str, overlap_chars: int) -> int:
         """Calculate tokens in overlap portion."""
@@ -1,10 +1,17 @@
 """Simple text chunker for LLM preprocessing."""
 
-from typing import List, Iterator, Dict, Any
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Iterator, Dict, Any, Optional
 from .models import ChunkingConfig, TextChunk, ChunkType
 from .simple_token_manager import TokenManager
 from .simple_boundary_optimizer import BoundaryOptimizer
 
+# Counts from the document's token table can differ from re-encoding a chunk on its own by a
+# few tokens at the chunk edges; chunks this close to the limit are counted exactly
+_EDGE_TOKEN_SLACK = 4
+
 
 class TextChunker:
     """Simple text chunker for preparing LLM input."""
@@ -17,75 +24,92 @@ class TextChunker:
         
     def chunk_text(self, text: str) -> List[TextChunk]:
         """Chunk text into token-limited chunks with good boundaries."""
+        return list(self._iter_chunks(text))
+    
+    def _iter_chunks(self, text: str) -> Iterator[TextChunk]:
+        """Build chunks lazily, yielding each one as soon as its boundary is known."""
         if not text.strip():
             raise ValueError("Input text cannot be empty")
         
-        chunks = []
-        remaining_text = text
+        text_length = len(text)
         chunk_id = 0
-        current_position = 0
         
-        while remaining_text.strip():
-            # Calculate target tokens for this chunk
-            target_tokens = self.token_manager.get_effective_chunk_size()
-            
-            # Find optimal boundary
-            boundary_pos, boundary_score = self.boundary_optimizer.find_optimal_boundary(
-                remaining_text, target_tokens
-            )
+        # Tokenize the document once for the whole walk; the table is released when the
+        # generator finishes or is closed
+        with self.token_manager.token_table(text):
+            # Walk the original text with a cursor instead of re-slicing the remainder
+            cursor = 0
+            while cursor < text_length and text[cursor].isspace():
+                cursor += 1
             
-            # Extract chunk text
-            chunk_text = remaining_text[:boundary_pos].strip()
-            if not chunk_text:
-                break
-            
-            # Handle overlap for non-first chunks
-            overlap_chars = 0
-            if chunk_id > 0 and self.config.overlap_tokens > 0:
-                overlap_text = self.boundary_optimizer.create_overlap(
-                    chunk_text, self.config.overlap_tokens
+            while cursor < text_length:
+                # Calculate target tokens for this chunk
+                target_tokens = self.token_manager.get_effective_chunk_size()
+                
+                # Find optimal boundary
+                boundary_pos, boundary_score, _ = self.boundary_optimizer.find_optimal_boundary(
+                    text, cursor, target_tokens
                 )
-                overlap_chars = len(overlap_text)
-            
-            # Determine chunk type
-            remaining_after = remaining_text[boundary_pos:].strip()
-            if chunk_id == 0:
-                chunk_type = ChunkType.FIRST
-            elif not remaining_after:
-                chunk_type = ChunkType.FINAL
-            else:
-                chunk_type = ChunkType.MIDDLE
-            
-            # Create chunk
-            chunk = TextChunk(
-                chunk_id=chunk_id,
-                chunk_type=chunk_type,
-                text=chunk_text,
-                token_count=self.token_manager.count_tokens(chunk_text),
-                start_position=current_position,
-                end_position=current_position + len(chunk_text),
-                overlap_with_previous=overlap_chars,
-                boundary_info=self.boundary_optimizer.get_boundary_info(remaining_text, boundary_pos),
-                boundary_score=boundary_score
-            )
-            
-            chunks.append(chunk)
-            
-            # Move to next chunk
-            remaining_text = remaining_text[boundary_pos:].strip()
-            current_position += boundary_pos
-            chunk_id += 1
-            
-            # Safety check
-            if boundary_pos == 0:
-                break
-        
-        return chunks
+                
+                # Extract chunk text
+                chunk_text = text[cursor:boundary_pos].rstrip()
+                if not chunk_text:
+                    break
+                
+                # Handle overlap for non-first chunks
+                overlap_chars = 0
+                if chunk_id > 0 and self.config.overlap_tokens > 0:
+                    overlap_start, overlap_end = self.boundary_optimizer.create_overlap_span(
+                        text, self.config.overlap_tokens, start=cursor, end=cursor + len(chunk_text)
+                    )
+                    overlap_chars = overlap_end - overlap_start
+                
+                # Count the stripped chunk so trailing whitespace before the boundary is left out
+                token_count = self.token_manager.count_prefix_tokens(
+                    text, cursor + len(chunk_text), start=cursor
+                )
+                if token_count + _EDGE_TOKEN_SLACK > self.config.max_chunk_tokens:
+                    token_count = self.token_manager.count_tokens(chunk_text)
+                
+                # Skip whitespace between this chunk and the next
+                next_cursor = boundary_pos
+                while next_cursor < text_length and text[next_cursor].isspace():
+                    next_cursor += 1
+                
+                # Determine chunk type
+                if chunk_id == 0:
+                    chunk_type = ChunkType.FIRST
+                elif next_cursor >= text_length:
+                    chunk_type = ChunkType.FINAL
+                else:
+                    chunk_type = ChunkType.MIDDLE
+                
+                # Create chunk
+                chunk = TextChunk(
+                    chunk_id=chunk_id,
+                    chunk_type=chunk_type,
+                    text=chunk_text,
+                    token_count=token_count,
+                    start_position=cursor,
+                    end_position=cursor + len(chunk_text),
+                    overlap_with_previous=overlap_chars,
+                    boundary_info=self.boundary_optimizer.get_boundary_info(text, boundary_pos),
+                    boundary_score=boundary_score
+                )
+                
+                yield chunk
+                
+                # Safety check
+                if boundary_pos <= cursor:
+                    break
+                
+                # Move to next chunk
+                cursor = next_cursor
+                chunk_id += 1
     
     def chunk_text_iterator(self, text: str) -> Iterator[TextChunk]:
         """Yield chunks one at a time for memory efficiency."""
-        for chunk in self.chunk_text(text):
-            yield chunk
+        return self._iter_chunks(text)
     
     def get_chunking_stats(self, chunks: List[TextChunk]) -> Dict[str, Any]:
         """Get statistics about the chunking process."""
@@ -93,11 +117,22 @@ class TextChunker:
             return {}
         
         total_chunks = len(chunks)
-        total_tokens = sum(chunk.token_count for chunk in chunks)
-        avg_boundary_score = sum(chunk.boundary_score for chunk in chunks) / total_chunks
-        
+        total_tokens = 0
+        total_score = 0.0
+        total_overlap = 0
+        max_tokens = min_tokens = chunks[0].token_count
         boundary_types = {}
+        
+        # Gather everything in a single pass over the chunks
         for chunk in chunks:
+            tokens = chunk.token_count
+            total_tokens += tokens
+            total_score += chunk.boundary_score
+            total_overlap += chunk.overlap_with_previous
+            if tokens > max_tokens:
+                max_tokens = tokens
+            if tokens < min_tokens:
+                min_tokens = tokens
             boundary_type = chunk.boundary_info.get("type", "unknown")
             boundary_types[boundary_type] = boundary_types.get(boundary_type, 0) + 1
         
@@ -105,11 +140,11 @@ class TextChunker:
             "total_chunks": total_chunks,
             "total_tokens": total_tokens,
             "avg_tokens_per_chunk": total_tokens / total_chunks,
-            "avg_boundary_score": avg_boundary_score,
+            "avg_boundary_score": total_score / total_chunks,
             "boundary_type_distribution": boundary_types,
-            "max_chunk_tokens": max(chunk.token_count for chunk in chunks),
-            "min_chunk_tokens": min(chunk.token_count for chunk in chunks),
-            "total_overlap_chars": sum(chunk.overlap_with_previous for chunk in chunks)
+            "max_chunk_tokens": max_tokens,
+            "min_chunk_tokens": min_tokens,
+            "total_overlap_chars": total_overlap
         }
     
     def validate_chunks(self, chunks: List[TextChunk]) -> List[str]:
@@ -131,6 +166,14 @@ class TextChunker:
             # Check for empty chunks
             if not chunk.text.strip():
                 issues.append(f"Chunk {i} has empty text")
+            
+            # Check chunk data (not validated when chunks are created)
+            if chunk.chunk_id < 0:
+                issues.append(f"Chunk {i} has negative chunk_id: {chunk.chunk_id}")
+            if chunk.token_count <= 0:
+                issues.append(f"Chunk {i} has non-positive token_count: {chunk.token_count}")
+            if chunk.boundary_score < 0 or chunk.boundary_score > 1:
+                issues.append(f"Chunk {i} has boundary_score outside 0-1: {chunk.boundary_score}")
         
         return issues
     
@@ -158,4 +201,31 @@ class TextChunker:
             "overlap_with_previous": chunk.overlap_with_previous,
             "boundary_info": chunk.boundary_info,
             "boundary_score": chunk.boundary_score
-        }
\ No newline at end of file
+        }
+
+
+def _chunk_document(config: ChunkingConfig, text: str) -> List[TextChunk]:
+    """Chunk a single document (module-level so worker processes can run it)."""
+    return TextChunker(config).chunk_text(text)
+
+
+def chunk_many(
+    docs: List[str], config: ChunkingConfig, max_workers: Optional[int] = None
+) -> List[List[TextChunk]]:
+    """Chunk independent documents in parallel worker processes, preserving order."""
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        return list(pool.map(_chunk_document, [config] * len(docs), docs))
+
+
+async def chunk_many_async(
+    docs: List[str], config: ChunkingConfig, executor: Executor
+) -> List[List[TextChunk]]:
+    """Chunk independent documents on the caller's executor without blocking the event loop.
+
+    The executor is owned by the caller so a long-lived pool can be reused across calls
+    and shut down outside the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(
+        *(loop.run_in_executor(executor, _chunk_document, config, doc) for doc in docs)
+    ))
\ No newline at end of file
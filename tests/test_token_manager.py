@@ -0,0 +1,108 @@
+"""Tests for token table offsets and the counts the chunker reads from them."""
+
+import pytest
+import tiktoken
+
+from translation_chunker import ChunkingConfig, TextChunker, TokenManager
+from translation_chunker import simple_token_manager
+from translation_chunker.text_chunker import _EDGE_TOKEN_SLACK
+
+# GPT-2 style pre-tokenizer: words keep their leading space, like cl100k_base
+_PAT_STR = r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+"""
+
+_TEXT = (
+    "Hello world. Next sentence here.\n\n"
+    "Tiếng Việt có dấu: người, được, trước, những.\n"
+    "The world is wide, the sentence is long. 🦙 Next one here!\n\n"
+) * 20
+
+
+def _build_encoding() -> tiktoken.Encoding:
+    """A small byte-level BPE so the tests run without downloading a real encoding."""
+    ranks = {bytes([b]): b for b in range(256)}
+    words = [" Next", " the", " world", "Hello", " sentence", " here"]
+    pieces = [word.encode("utf-8") for word in words]
+    # Only the first two bytes of these three-byte letters merge, so their last byte is a
+    # token of its own that starts inside the character
+    pieces += [letter.encode("utf-8")[:2] for letter in "ệế"]
+    for piece in pieces:
+        for end in range(2, len(piece) + 1):
+            ranks.setdefault(piece[:end], len(ranks))
+    return tiktoken.Encoding(name="test_bpe", pat_str=_PAT_STR, mergeable_ranks=ranks, special_tokens={})
+
+
+@pytest.fixture(scope="module")
+def encoding() -> tiktoken.Encoding:
+    return _build_encoding()
+
+
+@pytest.fixture(autouse=True)
+def local_encoding(monkeypatch, encoding):
+    monkeypatch.setattr(simple_token_manager, "_get_encoding", lambda name: encoding)
+
+
+@pytest.fixture
+def token_manager() -> TokenManager:
+    return TokenManager(ChunkingConfig(max_chunk_tokens=1000, overlap_tokens=0))
+
+
+def test_offsets_track_characters_split_across_tokens(token_manager, encoding):
+    tokens, offsets = token_manager._build_token_table(_TEXT)
+    token_bytes = encoding.decode_tokens_bytes(tokens)
+    assert any(0x80 <= piece[0] < 0xC0 for piece in token_bytes), "no token starts inside a character"
+
+    prefix = b""
+    for index, piece in enumerate(token_bytes):
+        # A token starting inside a character is placed at the start of that character
+        assert offsets[index] == len(prefix.decode("utf-8", errors="ignore"))
+        prefix += piece
+    assert offsets[-1] == len(_TEXT)
+
+
+def test_span_counts_token_straddling_cursor(token_manager):
+    text = "Hello world. Next sentence here."
+    cursor = text.index("Next")
+    tokens, offsets = token_manager._build_token_table(text)
+    # The whitespace skip leaves the cursor just inside the leading-space " Next" token
+    first = offsets.index(cursor - 1)
+    assert token_manager.tokenizer.decode([tokens[first]]) == " Next"
+
+    assert token_manager.count_prefix_tokens(text, len(text), start=cursor) == len(tokens) - first
+    assert token_manager.count_prefix_tokens_batch(text, [cursor + 1, len(text)], start=cursor) == [
+        1, len(tokens) - first
+    ]
+
+
+@pytest.mark.parametrize("start", [0, 1, 17, 40, 41, 42, 333, 1001])
+def test_counts_agree_with_reencoding(token_manager, start):
+    tokenizer = token_manager.tokenizer
+    with token_manager.token_table(_TEXT):
+        for position in range(start, len(_TEXT) + 1, 37):
+            exact = len(tokenizer.encode_ordinary(_TEXT[start:position]))
+            counted = token_manager.count_prefix_tokens(_TEXT, position, start=start)
+            assert abs(counted - exact) <= _EDGE_TOKEN_SLACK, (start, position)
+
+        for target in (1, 5, 50, 200):
+            boundary = token_manager.find_token_boundary(_TEXT, target, start=start)
+            assert start <= boundary <= len(_TEXT)
+            assert len(tokenizer.encode_ordinary(_TEXT[start:boundary])) <= target + _EDGE_TOKEN_SLACK
+
+
+def test_token_table_is_dropped_after_block(token_manager):
+    with token_manager.token_table(_TEXT):
+        with token_manager.token_table(_TEXT):
+            assert token_manager.count_tokens(_TEXT) == len(token_manager.encode_once(_TEXT))
+        assert token_manager._tables
+    assert not token_manager._tables
+
+
+@pytest.mark.parametrize("max_chunk_tokens, overlap_tokens", [(1000, 0), (200, 20), (60, 10), (30, 0)])
+def test_chunks_never_exceed_max_tokens(encoding, max_chunk_tokens, overlap_tokens):
+    chunker = TextChunker(ChunkingConfig(max_chunk_tokens=max_chunk_tokens, overlap_tokens=overlap_tokens))
+    chunks = chunker.chunk_text(_TEXT)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(encoding.encode_ordinary(chunk.text)) <= max_chunk_tokens
+        assert chunk.text == _TEXT[chunk.start_position:chunk.end_position]
+    assert chunker.validate_chunks(chunks) == []